@@ -1,5 +1,17 @@
+import functools
 import re
 
+from astrbot.api import logger
+
+# 用户正则的回溯风险粗筛（仅用于告警）：嵌套量词 (a+)+ / (a*)* 以及相邻通配 .*.*
+_NESTED_QUANTIFIER_RE = re.compile(r"\([^()]*[*+}][^()]*\)[*+{]")
+_ADJACENT_WILDCARD_RE = re.compile(r"\.[*+]\??\.[*+]")
+
+# 消息清洗规则。每条规则都带一个必需的字面量，正文里没有就不必跑正则
+_PROCESSED_NOTICE_RE = re.compile(r"[\*＊\-]?\s*此原图经过处理.*", re.IGNORECASE)
+_SUBMITTER_RE = re.compile(r"投稿 by .*", re.IGNORECASE)
+_MARKDOWN_LINK_RE = re.compile(r"\[(.*?)\]\((.*?)\)")
+
 
 def normalize_telegram_channel_name(raw: str) -> str:
     """标准化频道用户名、t.me 链接或数字 ID。
@@ -57,39 +69,64 @@ def to_telethon_entity(channel_name: str) -> str | int:
     return channel_name
 
 
+@functools.lru_cache(maxsize=128)
+def compile_user_regex(pattern: str, flags: int = 0) -> re.Pattern:
+    """编译并缓存用户配置的正则。
+
+    Python 的 re 匹配无法被中断，(a+)+ 之类的写法可能卡住事件循环，
+    因此按嵌套量词、相邻 .*.* 做启发式提示。该判断会误伤大量安全写法，
+    只在首次编译时告警一次，仍按原样编译，不改变已有规则的匹配结果。
+
+    Raises:
+        re.error: 正则本身非法；失败结果不会进入缓存。
+    """
+    compiled = re.compile(pattern, flags)
+    # 去掉转义字符与字符集，避免 \+、[+*] 这类字面量被误判为量词
+    skeleton = re.sub(r"\\.", "x", pattern)
+    skeleton = re.sub(r"\[[^\]]*\]", "x", skeleton)
+    if _NESTED_QUANTIFIER_RE.search(skeleton) or _ADJACENT_WILDCARD_RE.search(
+        skeleton
+    ):
+        logger.warning(
+            f"[Regex] 正则 '{pattern}' 含嵌套量词或相邻通配，"
+            "在特定文本上可能回溯较慢，如遇卡顿请改写。"
+        )
+    return compiled
+
+
 def clean_telegram_text(text: str, strip_links: bool = False) -> str:
     """清洗 Telegram 消息文本"""
     if not text:
         return ""
 
-    # 1. 移除特定的频道签名
-    lines = text.split("\n")
-    cleaned_lines = []
-    for line in lines:
-        if "频道" in line and "@" in line:
-            continue
-        if line.strip().startswith("@") and len(line) < 20:
-            continue
-        cleaned_lines.append(line)
-    text = "\n".join(cleaned_lines)
+    # 1. 移除特定的频道签名（两种签名行都含 @，大多数正文可直接跳过逐行扫描）
+    if "@" in text:
+        lines = text.split("\n")
+        cleaned_lines = []
+        for line in lines:
+            if "频道" in line and "@" in line:
+                continue
+            if line.strip().startswith("@") and len(line) < 20:
+                continue
+            cleaned_lines.append(line)
+        text = "\n".join(cleaned_lines)
 
     # 2. 正则内容清洗
-    patterns = [
-        r"[\*＊\-]?\s*此原图经过处理.*",
-        r"投稿 by .*",
-    ]
-    for pattern in patterns:
-        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
+    if "此原图经过处理" in text:
+        text = _PROCESSED_NOTICE_RE.sub("", text)
+    if "投稿" in text:
+        text = _SUBMITTER_RE.sub("", text)
 
     # 3. 去除粗体/斜体标记（可选保留，根据需求）
     text = text.replace("**", "").replace("__", "")
 
     # 4. 处理 Markdown 链接  ← 这里是重点修改
-    if strip_links:
-        # 只保留 [文本] 部分，丢弃 (链接)
-        text = re.sub(r"\[(.*?)\]\(.*?\)", r"\1", text)
-    else:
-        # 原有行为：显示 文本: 链接
-        text = re.sub(r"\[(.*?)\]\((.*?)\)", r"\1: \2", text)
+    if "](" in text:
+        if strip_links:
+            # 只保留 [文本] 部分，丢弃 (链接)
+            text = _MARKDOWN_LINK_RE.sub(r"\1", text)
+        else:
+            # 原有行为：显示 文本: 链接
+            text = _MARKDOWN_LINK_RE.sub(r"\1: \2", text)
 
     return text.strip()
@@ -139,14 +139,24 @@ class MediaDownloader:
                 f"[Downloader] 检测到消息 {msg.id} 中的{media_type}，开始下载..."
             )
 
+            # 每跨过一个 20% 档位只记一次，避免同一档位内每个分块都格式化日志。
+            last_step = 0
+
             def progress_callback(current, total):
-                if total > 0:
-                    pct = (current / total) * 100
-                    if int(pct) % 20 == 0 and int(pct) > 0:
-                        logger.debug(f"[Downloader] 正在下载 {msg.id}: {pct:.1f}%")
+                nonlocal last_step
+                if total <= 0:
+                    return
+                step = current * 5 // total
+                if step <= last_step:
+                    return
+                last_step = step
+                logger.debug(
+                    f"[Downloader] 正在下载 {msg.id}: {current / total * 100:.1f}%"
+                )
 
             retry_count = 3
             for attempt in range(retry_count):
+                last_step = 0
                 timeout_sec = self._download_timeout(msg)
                 try:
                     if not self.client.is_connected():
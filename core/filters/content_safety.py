@@ -1,5 +1,6 @@
 import asyncio
-import base64
+import binascii
+import functools
 import io
 import ipaddress
 import json
@@ -12,6 +13,11 @@ import aiohttp
 
 from astrbot.api import logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 JSON_CONTRACT = """
 无论上面的自定义规则如何描述，你都必须只返回 JSON 对象，不得使用 Markdown 代码块或附加文字。
 JSON 必须且只能包含两个字段：
@@ -39,6 +45,8 @@ DEFAULT_QR_RISK_KEYWORDS = [
     "裸聊",
 ]
 
+_BASE64_CHUNK_SIZE = 3 * 64 * 1024
+
 ResolvedAddress = tuple[int, str]
 AddressResolver = Callable[[str, int], Awaitable[list[ResolvedAddress]]]
 
@@ -75,6 +83,13 @@ class _PinnedResolver(aiohttp.abc.AbstractResolver):
         return None
 
 
+def dumps_json_body(payload: dict[str, Any]) -> bytes:
+    """序列化请求体；装了 orjson 时优先使用，内嵌 base64 图片的大请求体收益明显。"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
 def parse_ai_decision(raw: str) -> dict[str, Any]:
     text = str(raw or "").strip()
     if text.startswith("```") and text.endswith("```"):
@@ -96,7 +111,10 @@ def build_ai_prompt(custom_prompt: str) -> str:
     return f"{prompt}\n\n{JSON_CONTRACT}"
 
 
+@functools.lru_cache(maxsize=16)
 def openai_chat_url(base_url: str, allow_private_endpoint: bool = False) -> str:
+    # 同一端点每条消息都会走一遍，按 (base_url, 开关) 缓存解析与校验结果；
+    # 校验失败抛出的 ValueError 不会进入缓存。
     url = str(base_url or "").strip().rstrip("/")
     parsed = urlparse(url)
     if parsed.scheme not in {"http", "https"} or not parsed.hostname:
@@ -139,8 +157,15 @@ def image_data_url(image_bytes: bytes) -> str:
         mime_type = "image/webp"
     else:
         mime_type = "image/jpeg"
-    encoded = base64.b64encode(image_bytes).decode("ascii")
-    return f"data:{mime_type};base64,{encoded}"
+    # 分块编码进同一个 bytearray，只在最后解码一次，避免编码结果、
+    # 中间字符串和拼接结果同时驻留内存；块长取 3 的倍数保证拼接后仍是合法 base64
+    buffer = bytearray(f"data:{mime_type};base64,".encode("ascii"))
+    view = memoryview(image_bytes)
+    for start in range(0, len(view), _BASE64_CHUNK_SIZE):
+        buffer += binascii.b2a_base64(
+            view[start : start + _BASE64_CHUNK_SIZE], newline=False
+        )
+    return buffer.decode("ascii")
 
 
 def is_risky_qr_payload(payload: str, keywords: list[str]) -> bool:
@@ -169,6 +194,14 @@ class ContentSafetyFilter:
         self.qr_decoder = qr_decoder or self._decode_qr
         self.session_factory = session_factory
         self.address_resolver = address_resolver or self._resolve_addresses
+        # 复用同一 AI 端点的连接池，避免每条消息都重新握手；只有端点主机变化时才重建，
+        # 轮询 DNS / CDN 的解析结果变化只刷新固定解析器的地址表
+        self._session: Any = None
+        self._session_key: tuple | None = None
+        self._pinned_resolver: _PinnedResolver | None = None
+        # 会话的检查-替换-创建须串行；被替换但仍有请求在用的旧会话延后到最后一个请求结束再关闭
+        self._session_lock = asyncio.Lock()
+        self._session_leases: dict[Any, int] = {}
 
     @staticmethod
     async def _resolve_addresses(hostname: str, port: int) -> list[ResolvedAddress]:
@@ -188,13 +221,10 @@ class ContentSafetyFilter:
                 addresses.append(item)
         return addresses
 
-    async def _pinned_connector_for_url(
+    async def _validated_addresses_for_url(
         self,
         request_url: str,
-        allow_private_endpoint: bool,
-    ) -> aiohttp.TCPConnector | None:
-        if allow_private_endpoint:
-            return None
+    ) -> tuple[str, list[ResolvedAddress]]:
         parsed = urlparse(request_url)
         hostname = parsed.hostname
         if not hostname:
@@ -209,10 +239,66 @@ class ContentSafetyFilter:
                 raise ValueError(
                     "AI Base URL 不允许解析到私网/环回地址，请显式开启私网端点"
                 )
-        return aiohttp.TCPConnector(
-            resolver=_PinnedResolver(hostname, addresses),
-            use_dns_cache=True,
-        )
+        return hostname, addresses
+
+    async def _session_for_url(self, request_url: str, allow_private_endpoint: bool):
+        """租用可复用的会话；每次调用仍会重新解析并校验端点地址。
+
+        调用方用完后必须调用 `_release_session()` 归还。
+        """
+        hostname = ""
+        addresses: list[ResolvedAddress] = []
+        if not allow_private_endpoint:
+            hostname, addresses = await self._validated_addresses_for_url(request_url)
+        key = (allow_private_endpoint, hostname)
+        async with self._session_lock:
+            if key == self._session_key and self._session is not None:
+                if self._pinned_resolver is not None:
+                    # 新地址已通过校验；解析器不做 DNS 缓存，后续新建连接立即使用新地址表
+                    self._pinned_resolver.addresses = addresses
+            else:
+                retired = self._session
+                session_kwargs: dict[str, Any] = {}
+                self._pinned_resolver = None
+                if not allow_private_endpoint:
+                    self._pinned_resolver = _PinnedResolver(hostname, addresses)
+                    session_kwargs["connector"] = aiohttp.TCPConnector(
+                        resolver=self._pinned_resolver,
+                        use_dns_cache=False,
+                    )
+                self._session = self.session_factory(**session_kwargs)
+                self._session_key = key
+                if retired is not None and not self._session_leases.get(retired):
+                    await self._close_session(retired)
+            session = self._session
+            self._session_leases[session] = self._session_leases.get(session, 0) + 1
+            return session
+
+    async def _release_session(self, session: Any) -> None:
+        """归还会话；已被替换且无人使用的旧会话在此关闭。"""
+        async with self._session_lock:
+            leases = self._session_leases.get(session, 0) - 1
+            if leases > 0:
+                self._session_leases[session] = leases
+                return
+            self._session_leases.pop(session, None)
+            if session is not self._session:
+                await self._close_session(session)
+
+    @staticmethod
+    async def _close_session(session: Any) -> None:
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def close(self) -> None:
+        """关闭复用的 AI 请求会话（插件停止时调用，不再等待在途请求）。"""
+        async with self._session_lock:
+            sessions = [self._session, *self._session_leases]
+            self._session, self._session_key = None, None
+            self._pinned_resolver = None
+            self._session_leases.clear()
+        for session in dict.fromkeys(sessions):
+            await self._close_session(session)
 
     @staticmethod
     def _decode_qr(image_bytes: bytes) -> list[str] | None:
@@ -298,10 +384,12 @@ class ContentSafetyFilter:
             }
         ]
         if image_bytes:
+            # 整张图片做 base64 编码是纯 CPU 操作，放到线程里避免阻塞事件循环
+            data_url = await asyncio.to_thread(image_data_url, image_bytes)
             content.append(
                 {
                     "type": "image_url",
-                    "image_url": {"url": image_data_url(image_bytes)},
+                    "image_url": {"url": data_url},
                 }
             )
         payload = {
@@ -321,35 +409,31 @@ class ContentSafetyFilter:
             )
         except (TypeError, ValueError):
             timeout_seconds = 20
-        connector = None
         try:
             timeout = aiohttp.ClientTimeout(total=timeout_seconds)
             allow_private_endpoint = bool(
                 config.get("ai_filter_allow_private_endpoint", False)
             )
             request_url = openai_chat_url(base_url, allow_private_endpoint)
-            connector = await self._pinned_connector_for_url(
-                request_url,
-                allow_private_endpoint,
-            )
-            session_kwargs: dict[str, Any] = {"timeout": timeout}
-            if connector is not None:
-                session_kwargs["connector"] = connector
-            async with self.session_factory(**session_kwargs) as session:
+            session = await self._session_for_url(request_url, allow_private_endpoint)
+            try:
                 async with session.post(
                     request_url,
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    json=payload,
+                    headers={
+                        "Authorization": f"Bearer {api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    data=dumps_json_body(payload),
                     allow_redirects=False,
+                    timeout=timeout,
                 ) as response:
                     if response.status < 200 or response.status >= 300:
                         raise RuntimeError(f"AI HTTP {response.status}")
                     data = await response.json()
+            finally:
+                await self._release_session(session)
             raw = data["choices"][0]["message"]["content"]
             return parse_ai_decision(raw)
         except Exception as exc:
             logger.warning(f"[ContentSafety] AI 过滤不可用: {type(exc).__name__}")
             return {"filter": False, "msg": "AI 过滤不可用，已放行"}
-        finally:
-            if connector is not None and not connector.closed:
-                await connector.close()
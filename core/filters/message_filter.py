@@ -5,6 +5,8 @@ from telethon.tl.types import Message
 
 from astrbot.api import logger
 
+from ...common.text_tools import compile_user_regex
+
 
 class MessageFilter:
     """消息过滤器 - 处理关键词、正则表达式、hashtag 等过滤逻辑"""
@@ -42,7 +44,7 @@ class MessageFilter:
             # 2. 正则过滤
             if filter_regex:
                 try:
-                    if re.search(filter_regex, msg.text or ""):
+                    if compile_user_regex(filter_regex).search(msg.text or ""):
                         if logger_func:
                             logger_func(
                                 f"[Filter] Filtered by regex: {channel_name} - {msg_text[:50]}"
@@ -10,6 +10,7 @@ from astrbot.api import AstrBotConfig, logger, star
 
 from ..common.storage import Storage
 from ..common.text_tools import (
+    compile_user_regex,
     is_numeric_channel_id,
     normalize_telegram_channel_name,
     to_telethon_entity,
@@ -493,7 +494,9 @@ class Forwarder:
             if not pattern:
                 continue
             try:
-                if re.search(pattern, full_check_text, re.IGNORECASE | re.DOTALL):
+                if compile_user_regex(pattern, re.IGNORECASE | re.DOTALL).search(
+                    full_check_text
+                ):
                     return True
             except re.error as e:
                 logger.error(f"[Monitor] 非法正则表达式 '{pattern}': {e}")
@@ -516,10 +519,8 @@ class Forwarder:
         for pattern in patterns:
             if pattern:
                 try:
-                    if re.search(
-                        pattern,
-                        full_check_text,
-                        re.IGNORECASE | re.DOTALL,
+                    if compile_user_regex(pattern, re.IGNORECASE | re.DOTALL).search(
+                        full_check_text
                     ):
                         logger.info(
                             f"[Filter] 消息 {msg.id} 命中正则匹配: {pattern[:30]}..."
@@ -830,7 +831,9 @@ class Forwarder:
                         pass
 
                 lock = self._get_channel_lock(channel_name)
-                if lock.locked():
+                # 定时抓取遇到在途抓取直接跳过；手动触发则等它结束后再补拉一次，
+                # 保证随后的立即发送能带上这段时间入队的消息
+                if lock.locked() and not force:
                     logger.debug(
                         f"[Capture] 频道 {channel_name} 正在抓取中，跳过本次。"
                     )
@@ -1146,6 +1149,12 @@ class Forwarder:
             logger.debug("[Send] 当前处于宵禁时间，跳过转发任务。")
             return
 
+        # 定时发送不在锁上排队：已有发送在进行时本轮直接让出，队列留给下个周期，
+        # 避免手动 / 监听触发的立即发送排在积压的定时任务之后迟迟得不到执行
+        if not force_immediate and self._send_dispatch_lock.locked():
+            logger.debug("[Send] 已有发送任务在进行，跳过本轮定时发送。")
+            return
+
         self._track_current_task()
         self._track_active_send_task()
         clear_generation = self._queue_clear_generation
@@ -1385,6 +1394,8 @@ class Forwarder:
                         return
                     try:
                         effective_cfg = self._get_effective_config(channel)
+                        forward_types = effective_cfg["forward_types"]
+                        max_file_size = effective_cfg["max_file_size"]
                         msgs = await self.client.get_messages(
                             to_telethon_entity(channel), ids=ids
                         )
@@ -1411,8 +1422,6 @@ class Forwarder:
                                 continue
 
                             # 类型过滤
-                            forward_types = effective_cfg["forward_types"]
-                            max_file_size = effective_cfg["max_file_size"]
                             msg_type = "文字"
                             if m.photo:
                                 msg_type = "图片"
@@ -1650,8 +1659,11 @@ class Forwarder:
             attempted_send_count = sum(len(msgs) for msgs, _ in final_batches)
             send_summary = None
             batch_meta = []
+            effective_cfgs: dict[str, dict] = {}
             for msgs, channel in final_batches:
-                effective_cfg = self._get_effective_config(channel)
+                if channel not in effective_cfgs:
+                    effective_cfgs[channel] = self._get_effective_config(channel)
+                effective_cfg = effective_cfgs[channel]
                 target_sessions = effective_cfg.get("effective_target_qq_sessions", [])
                 batch_meta.append(
                     {
@@ -1947,8 +1959,16 @@ class Forwarder:
             for item in self.storage.get_all_pending():
                 pending_items_by_key[(item["channel"], item["id"])].append(item)
 
+            # 同一频道的生效配置在本次调度内不变，按频道只计算一次。
+            effective_cfgs: dict[str, dict] = {}
+
+            def effective_cfg_for(channel: str) -> dict:
+                if channel not in effective_cfgs:
+                    effective_cfgs[channel] = self._get_effective_config(channel)
+                return effective_cfgs[channel]
+
             for batch_index, (msgs, src_channel) in enumerate(batches_with_channel):
-                effective_cfg = self._get_effective_config(src_channel)
+                effective_cfg = effective_cfg_for(src_channel)
                 target_sessions = self._normalize_target_list(
                     effective_cfg["effective_target_qq_sessions"]
                 )
@@ -1995,7 +2015,7 @@ class Forwarder:
                     if should_abort_send():
                         close_exclusive_tasks()
                         return qq_summary or QQSendSummary()
-                    effective_cfg = self._get_effective_config(src_channel)
+                    effective_cfg = effective_cfg_for(src_channel)
                     target_sessions = effective_cfg["effective_target_qq_sessions"]
                     if not target_sessions:
                         continue
@@ -2068,7 +2088,7 @@ class Forwarder:
 
                     first_channel = involved_list[0]
                     display_name = await self._get_display_name(first_channel)
-                    effective_cfg = self._get_effective_config(first_channel)
+                    effective_cfg = effective_cfg_for(first_channel)
                     if should_abort_send():
                         return qq_summary or QQSendSummary()
 
@@ -2095,7 +2115,7 @@ class Forwarder:
                             continue
 
                         display_name = await self._get_display_name(src_channel)
-                        effective_cfg = self._get_effective_config(src_channel)
+                        effective_cfg = effective_cfg_for(src_channel)
                         if should_abort_send():
                             return qq_summary or QQSendSummary()
                         channel_summary = await self._send_to_qq_and_count(
@@ -2116,7 +2136,7 @@ class Forwarder:
                 for src_channel, msg_groups in qq_send_groups.items():
                     if should_abort_send():
                         return qq_summary or QQSendSummary()
-                    effective_cfg = self._get_effective_config(src_channel)
+                    effective_cfg = effective_cfg_for(src_channel)
                     target_sessions = effective_cfg["effective_target_qq_sessions"]
                     if not target_sessions:
                         continue
@@ -2193,7 +2213,7 @@ class Forwarder:
                     ):
                         continue
                     try:
-                        effective_cfg = self._get_effective_config(src_channel)
+                        effective_cfg = effective_cfg_for(src_channel)
                         await self.tg_sender.send(
                             batches=[msgs],
                             src_channel=src_channel,
@@ -2320,7 +2340,15 @@ class Forwarder:
     async def shutdown(self, timeout: float = 10.0) -> None:
         """等待运行中的任务结束；超时后取消剩余任务。"""
         self.request_stop()
+        try:
+            await self._wait_active_tasks(timeout)
+        finally:
+            with suppress(Exception):
+                await self.qq_sender.wait_pending_cleanups()
+            with suppress(Exception):
+                await self.content_safety_filter.close()
 
+    async def _wait_active_tasks(self, timeout: float) -> None:
         pending_tasks = [task for task in self._active_tasks if not task.done()]
         if not pending_tasks:
             return
@@ -2395,14 +2423,14 @@ class Forwarder:
                     )
                 else:
                     # 无冷启动设置：初始化 last_id 为最新消息 ID，不搬运旧消息
-                    msgs = await self.client.get_messages(
+                    async for latest in self.client.iter_messages(
                         to_telethon_entity(channel_name), limit=1
-                    )
-                    if msgs:
-                        self.storage.update_last_id(channel_name, msgs[0].id)
+                    ):
+                        self.storage.update_last_id(channel_name, latest.id)
                         logger.info(
-                            f"[Fetch] {channel_name}: 首次运行且无冷启动设置，初始化 ID -> {msgs[0].id}"
+                            f"[Fetch] {channel_name}: 首次运行且无冷启动设置，初始化 ID -> {latest.id}"
                         )
+                        break
                     return []
             else:
                 # 2. 正常增量抓取
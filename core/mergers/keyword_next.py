@@ -6,6 +6,7 @@ from telethon.tl.types import Message
 
 from astrbot.api import logger
 
+from ...common.text_tools import compile_user_regex
 from .base import MergeRule
 
 
@@ -44,7 +45,7 @@ class KeywordNextNMerge(MergeRule):
         start_index: int,
         messages: list[tuple[str, Message]],
         channel_name: str,
-        used_indices: set,
+        used_indices: bytearray,
     ) -> dict:
         start_msg = messages[start_index]
         _, trigger = start_msg
@@ -56,7 +57,7 @@ class KeywordNextNMerge(MergeRule):
         window_closed_by_later_message = False
 
         for i in range(start_index + 1, len(messages)):
-            if i in used_indices:
+            if used_indices[i]:
                 continue
 
             candidate = messages[i]
@@ -170,7 +171,9 @@ class KeywordNextNMerge(MergeRule):
         if self.trigger_regex:
             try:
                 return bool(
-                    re.search(self.trigger_regex, full_text, re.IGNORECASE | re.DOTALL)
+                    compile_user_regex(
+                        self.trigger_regex, re.IGNORECASE | re.DOTALL
+                    ).search(full_text)
                 )
             except re.error as e:
                 logger.error(
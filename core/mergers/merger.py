@@ -1,3 +1,4 @@
+from collections import deque
 from typing import cast
 
 from telethon.tl.types import Message
@@ -82,15 +83,21 @@ class MessageMerger:
             logger.debug("[Merge] 未配置合并规则，跳过处理。")
             return messages
 
+        # 调用方按频道分批，大多数频道没有规则，整批原样放行，不进入逐条分组循环
+        if self.merge_rules.keys().isdisjoint(channel for channel, _ in messages):
+            logger.debug("[Merge] 本批消息所在频道均无合并规则，跳过处理。")
+            return messages
+
         logger.debug(
             f"[Merge] 正在处理 {len(messages)} 条消息，生效规则: {list(self.merge_rules.keys())}"
         )
 
         merged_messages = []
-        used_indices = set()
+        # 按下标标记已归组的消息，bytearray 比 set 更省内存与哈希开销
+        used_indices = bytearray(len(messages))
 
         for i, msg1 in enumerate(messages):
-            if i in used_indices:
+            if used_indices[i]:
                 continue
 
             channel_name, message1 = msg1
@@ -99,7 +106,7 @@ class MessageMerger:
             rules = self.merge_rules.get(channel_name, [])
             if not rules:
                 merged_messages.append(msg1)
-                used_indices.add(i)
+                used_indices[i] = 1
                 continue
 
             logger.debug(
@@ -131,11 +138,11 @@ class MessageMerger:
 
                 merged_messages.extend(group_msgs)
                 for idx in group_indices_list:
-                    used_indices.add(idx)
+                    used_indices[idx] = 1
             else:
                 # 没有找到可合并的消息，保持原样
                 merged_messages.append(msg1)
-                used_indices.add(i)
+                used_indices[i] = 1
 
         logger.info(
             f"[Merge] 消息合并完成: 处理前 {len(messages)} 条 -> 处理后 {len(merged_messages)} 条"
@@ -165,7 +172,7 @@ class MessageMerger:
         messages: list[tuple[str, Message]],
         channel_name: str,
         rule: MergeRule,
-        used_indices: set,
+        used_indices: bytearray,
     ) -> dict:
         """
         查找与起始消息可合并的所有消息
@@ -175,7 +182,7 @@ class MessageMerger:
             messages: 所有消息列表
             channel_name: 频道名称
             rule: 合并规则实例
-            used_indices: 已使用的索引集合
+            used_indices: 已使用的索引标记（下标处非 0 表示已归组）
 
         Returns:
             dict: {"messages": List[Tuple[str, Message]], "indices": List[int]}
@@ -187,12 +194,12 @@ class MessageMerger:
             )
 
         start_msg = messages[start_index]
-        group_messages = [start_msg]
-        group_indices = [start_index]
+        group_messages = deque([start_msg])
+        group_indices = deque([start_index])
 
         # 向前搜索可合并的消息
         for i in range(start_index + 1, len(messages)):
-            if i in used_indices:
+            if used_indices[i]:
                 continue
 
             candidate_msg = messages[i]
@@ -209,7 +216,7 @@ class MessageMerger:
 
         # 向后搜索可合并的消息（处理预览图在原图之后的情况）
         for i in range(start_index - 1, -1, -1):
-            if i in used_indices:
+            if used_indices[i]:
                 continue
 
             candidate_msg = messages[i]
@@ -221,7 +228,7 @@ class MessageMerger:
 
             # 检查是否可以合并（注意：candidate_msg 是预览图，start_msg 是原图）
             if rule.can_merge(channel_name, candidate_msg, start_msg):
-                group_messages.insert(0, candidate_msg)  # 插入到最前面
-                group_indices.insert(0, i)
+                group_messages.appendleft(candidate_msg)  # 插入到最前面
+                group_indices.appendleft(i)
 
-        return {"messages": group_messages, "indices": group_indices}
+        return {"messages": list(group_messages), "indices": list(group_indices)}
@@ -27,6 +27,21 @@ class SomeACGPreviewPlusOriginal(MergeRule):
         _, message1 = msg1
         _, message2 = msg2
 
+        # 先检查时间差：合并引擎会拿起始消息与整批消息逐一比较，
+        # 时间窗口外的候选直接淘汰，不再走文本/文件名解析
+        if message1.date is None or message2.date is None:
+            logger.debug(
+                f"[SomeACG] 消息时间戳缺失: msg1.date={message1.date}, msg2.date={message2.date}"
+            )
+            return False
+
+        time_window = self.config.get("time_window_seconds", 10)
+        time_diff = (message2.date - message1.date).total_seconds()
+
+        if time_diff < 0 or time_diff > time_window:
+            logger.debug(f"[SomeACG] 超出时间窗口: {time_diff}s > {time_window}s")
+            return False
+
         # 检查 msg1 是否是预览图说明
         if not self._is_preview_message(message1):
             logger.debug(
@@ -89,20 +104,6 @@ class SomeACGPreviewPlusOriginal(MergeRule):
                 )
                 return False
 
-        # 检查时间差
-        if message1.date is None or message2.date is None:
-            logger.debug(
-                f"[SomeACG] 消息时间戳缺失: msg1.date={message1.date}, msg2.date={message2.date}"
-            )
-            return False
-
-        time_window = self.config.get("time_window_seconds", 10)
-        time_diff = (message2.date - message1.date).total_seconds()
-
-        if time_diff < 0 or time_diff > time_window:
-            logger.debug(f"[SomeACG] 超出时间窗口: {time_diff}s > {time_window}s")
-            return False
-
         original_type = "Audio" if is_audio_original else "Document"
         logger.info(
             f"[SomeACG] Can merge: msg{message1.id} (preview) + msg{message2.id} ({original_type}), pixiv_id={pixiv_id1}, time_diff={time_diff}s"
@@ -7,6 +7,7 @@
 import asyncio
 import os
 import time
+import weakref
 from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -37,11 +38,11 @@ from .qq_media import (
     Image,
     Record,
     Video,
-    batch_contains_audio,
     dispatch_media_file,
     map_path_with_config,
     should_merge_batch_nodes,
 )
+from .qq_rate_limit import TokenBucket
 from .qq_reply_preview import (
     build_reply_preview,
     get_sender_display_name,
@@ -77,7 +78,10 @@ QQ_LARGE_FILE_GRACE_THRESHOLD_BYTES = 10 * 1024 * 1024
 QQ_LARGE_FILE_GRACE_STEP_BYTES = 10 * 1024 * 1024
 QQ_LARGE_FILE_GRACE_STEP_SEC = 5.0
 QQ_MAX_INITIAL_SEND_TIMEOUT_SEC = 300.0
+# bot 身份缓存有效期：NapCat 可能在同一适配器上换号重连，过期后重新拉取登录信息
+QQ_LOGIN_INFO_TTL_SEC = 300.0
 MEDIA_SEND_KINDS = {
+    "image_batch",
     "audio_record",
     "audio_file",
     "video_file",
@@ -123,38 +127,111 @@ class QQSender:
         self.context = context
         self.config = config
         self.downloader = downloader
-        self._group_locks = {}  # 群锁，防止并发发送
+        # 群锁，防止并发发送；弱引用持有，没有协程使用时自动回收
+        self._group_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        # 普通发送的逐目标令牌桶需跨多次 send() 保留补充进度；
+        # 已补满且目标锁无人持有的桶在新建桶时顺带回收，条目数随活跃目标而非历史目标增长
+        self._send_buckets: dict[str, TokenBucket] = {}
         self.platform_id = None  # 动态捕获的平台 ID
         self.bot = None  # 动态捕获的 bot 实例
         self.node_name = None  # 合并转发消息时显示的 bot 昵称
+        self._self_id: int | None = None  # bot QQ 号，获取登录信息后缓存
+        self._login_info_at = 0.0  # 上次成功获取登录信息的 monotonic 时间
         self._target_circuit: dict[str, dict[str, float | int]] = {}
         self._debug_override: dict[str, bool] = {}
         self._log_policy = QQLogPolicy(self._debug_enabled)
+        self._pending_cleanups: set[asyncio.Future] = set()
 
-    async def _ensure_node_name(self, bot, cache_fallback: bool = False):
-        """获取 bot 昵称"""
-        if self.node_name and self.node_name != "AstrBot":
-            return self.node_name
+    async def _load_login_info(self, bot) -> None:
+        """拉取并缓存 bot 登录信息（QQ 号与昵称）。
+
+        成功获取后在 `QQ_LOGIN_INFO_TTL_SEC` 内不再重复请求，过期后重新拉取，
+        以跟上同一适配器换号重连的情况；获取失败或 QQ 号无效时不缓存，下次发送再重试。
+        """
+        if (
+            self._self_id is not None
+            and time.monotonic() - self._login_info_at < QQ_LOGIN_INFO_TTL_SEC
+        ):
+            return
 
         try:
-            # 优先从登录信息获取
             info = await bot.get_login_info()
-            if info and (nickname := info.get("nickname")):
-                self.node_name = str(nickname)
-                logger.debug(f"[QQSender] 获取到 bot 昵称: {self.node_name}")
-            else:
-                logger.debug("[QQSender] 未能从登录信息获取到昵称")
         except Exception as e:
-            logger.debug(f"[QQSender] 获取 bot 昵称异常: {e}")
+            logger.debug(f"[QQSender] 获取 bot 登录信息异常: {e}")
+            return
+        if not info:
+            logger.debug("[QQSender] 未能获取到 bot 登录信息")
+            return
+
+        try:
+            self_id = int(info.get("user_id", 0) or 0)
+        except (TypeError, ValueError):
+            self_id = 0
+        if self_id <= 0:
+            logger.debug("[QQSender] 登录信息中缺少有效的 user_id")
+            self._self_id = None
+            return
+        if self._self_id is not None and self._self_id != self_id:
+            logger.info(f"[QQSender] bot 账号已变更: {self._self_id} -> {self_id}")
+        self._self_id = self_id
+        self._login_info_at = time.monotonic()
+
+        nickname = info.get("nickname")
+        if nickname:
+            self.node_name = str(nickname)
+            logger.debug(f"[QQSender] 获取到 bot 昵称: {self.node_name}")
+        else:
+            logger.debug("[QQSender] 未能从登录信息获取到昵称")
+
+    def invalidate_login_info(self) -> None:
+        """清除已缓存的 bot 身份，bot 重新登录或更换账号后调用。"""
+        self._self_id = None
+        self._login_info_at = 0.0
+        self.node_name = None
+
+    async def _ensure_node_name(self, bot, cache_fallback: bool = False):
+        """获取 bot 昵称"""
+        if not self.node_name or self.node_name == "AstrBot":
+            await self._load_login_info(bot)
 
         if cache_fallback and not self.node_name:
             self.node_name = "AstrBot"
         return self.node_name
 
     def _get_lock(self, group_id):
-        if group_id not in self._group_locks:
-            self._group_locks[group_id] = asyncio.Lock()
-        return self._group_locks[group_id]
+        """获取目标会话锁。
+
+        查找与创建之间没有 await，在单线程事件循环中天然原子，并发协程不会各自建出两把锁；
+        锁存于弱引用字典，无人持有后自动回收，字典不会随目标数无限增长。
+        """
+        lock = self._group_locks.get(group_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._group_locks[group_id] = lock
+        return lock
+
+    def _get_send_bucket(self, target_session: str) -> TokenBucket:
+        bucket = self._send_buckets.get(target_session)
+        if bucket is None:
+            self._prune_idle_send_buckets()
+            bucket = TokenBucket(rate=0.0, capacity=1)
+            self._send_buckets[target_session] = bucket
+        return bucket
+
+    def _prune_idle_send_buckets(self) -> None:
+        """回收已补满的空闲令牌桶。
+
+        目标锁仍在弱引用字典里说明有分发正在使用或等待该目标，此时保留其桶，
+        避免分发中途持有的旧桶与新建的满桶同时放行。
+        """
+        now = time.monotonic()
+        for target_session, bucket in list(self._send_buckets.items()):
+            if target_session in self._group_locks:
+                continue
+            if bucket.is_full(now):
+                del self._send_buckets[target_session]
 
     def _debug_enabled(self) -> bool:
         """检查当前是否启用 debug 日志模式。
@@ -220,19 +297,6 @@ class QQSender:
         timeout = DEFAULT_QQ_SEND_TIMEOUT_SEC + steps * QQ_LARGE_FILE_GRACE_STEP_SEC
         return min(float(timeout), QQ_MAX_INITIAL_SEND_TIMEOUT_SEC)
 
-    def _resolve_send_timeout_sec(
-        self,
-        send_kind: SendKind,
-        components: list[object] | None = None,
-    ) -> float:
-        if components is None:
-            components = []
-        if send_kind not in MEDIA_SEND_KINDS:
-            return DEFAULT_QQ_SEND_TIMEOUT_SEC
-        return self._timeout_for_payload_size(
-            self._message_chain_local_file_size(components)
-        )
-
     async def _send_with_timeout(
         self,
         unified_msg_origin: str,
@@ -252,7 +316,14 @@ class QQSender:
         )
         payload_file = getattr(primary_component, "file", None)
         if timeout_sec is None:
-            timeout_sec = self._resolve_send_timeout_sec(send_kind, components)
+            if send_kind in MEDIA_SEND_KINDS:
+                # 逐个 stat 本地媒体文件放到线程里，慢文件系统下不阻塞其它目标的发送
+                payload_size = await asyncio.to_thread(
+                    self._message_chain_local_file_size, components
+                )
+                timeout_sec = self._timeout_for_payload_size(payload_size)
+            else:
+                timeout_sec = DEFAULT_QQ_SEND_TIMEOUT_SEC
         try:
             await asyncio.wait_for(
                 self.context.send_message(unified_msg_origin, message_chain),
@@ -323,10 +394,6 @@ class QQSender:
             strip_links=strip_links,
         )
 
-    @staticmethod
-    def _batch_contains_audio(nodes_data: list[list[object]]) -> bool:
-        return batch_contains_audio(nodes_data)
-
     @staticmethod
     def _should_merge_batch_nodes(batch_data: ProcessedBatchData) -> bool:
         return should_merge_batch_nodes(batch_data)
@@ -517,17 +584,13 @@ class QQSender:
         if bot and not self.bot:
             self.bot = bot
 
-        self_id = 0
-        node_name = (
-            await self._ensure_node_name(bot, cache_fallback=True) if bot else "AstrBot"
-        ) or "AstrBot"
-        if bot:
-            try:
-                info = await bot.get_login_info()
-                self_id = info.get("user_id", 0)
-            except Exception as e:
-                logger.error(f"[QQSender] 获取 bot 详细信息失败: {e}")
-        return self_id, node_name
+        if not bot:
+            return 0, "AstrBot"
+        # 昵称与 QQ 号来自同一次 get_login_info，缓存有效期内后续发送不再发起 RPC
+        await self._load_login_info(bot)
+        if not self.node_name:
+            self.node_name = "AstrBot"
+        return self._self_id or 0, self.node_name
 
     def _build_send_summary(
         self,
@@ -548,8 +611,34 @@ class QQSender:
     def _cleanup_processed_batches(
         self, processed_batches: list[ProcessedBatchData]
     ) -> None:
-        local_files = collect_processed_batch_local_files(processed_batches)
-        self._cleanup_files(local_files)
+        self._schedule_cleanup_files(
+            collect_processed_batch_local_files(processed_batches)
+        )
+
+    def _schedule_cleanup_files(self, local_files: list[str]) -> None:
+        """在线程池中删除临时文件，调用方不等待文件系统。"""
+        if not local_files:
+            return
+        # 删除临时文件不影响发送结果，交给线程池执行，发送流程不必等待文件系统；
+        # 漏删的文件会在下次启动时由孤儿文件清理兜底
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._cleanup_files(local_files)
+            return
+        future = loop.run_in_executor(None, self._cleanup_files, local_files)
+        self._pending_cleanups.add(future)
+        future.add_done_callback(self._pending_cleanups.discard)
+
+    async def wait_pending_cleanups(self, timeout: float = 5.0) -> None:
+        """插件停止前等待后台临时文件清理完成，超时则留给下次启动兜底。"""
+        if not self._pending_cleanups:
+            return
+        _, pending = await asyncio.wait(set(self._pending_cleanups), timeout=timeout)
+        if pending:
+            logger.warning(
+                f"[QQSender] 等待临时文件清理超时，剩余 {len(pending)} 项留待下次启动清理。"
+            )
 
     async def send(
         self,
@@ -690,6 +779,7 @@ class QQSender:
                 self_id=self_id,
                 node_name=node_name,
                 get_lock=self._get_lock,
+                get_send_bucket=self._get_send_bucket,
                 target_is_open=self._target_is_open,
                 record_target_success=self._record_target_success,
                 record_target_failure=self._record_target_failure,
@@ -732,28 +822,51 @@ class QQSender:
             parts.append(part)
         return Path(anchor, *parts) if anchor else Path(*parts)
 
-    def _is_plugin_data_file(self, path: str) -> bool:
+    def _plugin_data_dirs(self) -> tuple[Path, Path] | None:
+        """返回插件数据目录的 (字面绝对路径, 真实路径)，不可用时返回 None。"""
         plugin_data_dir = getattr(self, "plugin_data_dir", None) or getattr(
             self.downloader, "plugin_data_dir", None
         )
         if not plugin_data_dir:
-            return False
+            return None
         try:
             plugin_entry_dir = self._absolute_lexical_path(plugin_data_dir)
+            return plugin_entry_dir, plugin_entry_dir.resolve()
+        except (OSError, RuntimeError, ValueError):
+            return None
+
+    def _is_plugin_data_file(
+        self,
+        path: str,
+        plugin_dirs: tuple[Path, Path] | None = None,
+        require_file: bool = True,
+    ) -> bool:
+        if plugin_dirs is None:
+            plugin_dirs = self._plugin_data_dirs()
+        if plugin_dirs is None:
+            return False
+        plugin_entry_dir, plugin_real_dir = plugin_dirs
+        try:
             entry_path = self._absolute_lexical_path(path)
-            plugin_real_dir = plugin_entry_dir.resolve()
             real_path = entry_path.resolve()
             entry_path.relative_to(plugin_entry_dir)
             real_path.relative_to(plugin_real_dir)
-            return entry_path.is_file()
+            return entry_path.is_file() if require_file else True
         except (OSError, RuntimeError, ValueError):
             return False
 
     def _cleanup_files(self, files: list[str]):
         """清理临时下载的文件"""
+        # 数据目录只解析一次；是否存在交给 os.remove 判断，省去额外的 stat
+        plugin_dirs = self._plugin_data_dirs()
+        if plugin_dirs is None:
+            return
         for f in files:
-            if self._is_plugin_data_file(f):
-                try:
-                    os.remove(f)
-                except OSError as e:
-                    logger.warning(f"[QQSender] 清理临时文件失败: {f} ({e})")
+            if not self._is_plugin_data_file(f, plugin_dirs, require_file=False):
+                continue
+            try:
+                os.remove(f)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"[QQSender] 清理临时文件失败: {f} ({e})")
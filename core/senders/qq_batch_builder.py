@@ -5,6 +5,7 @@
 这样发送器后续只需要关心“怎么发”，而不必重复处理“怎么组装”。
 """
 
+import asyncio
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, TypedDict
 
@@ -20,10 +21,16 @@ from astrbot.api.message_components import (
 )
 
 from ...common.text_tools import clean_telegram_text, is_numeric_channel_id
+from .qq_send_prep import positive_int
 
 if TYPE_CHECKING:
     from .qq import QQSender
 
+# 同一批次内媒体并发下载的默认上限，避免对 Telegram 造成过大压力；
+# 可通过 forward_config.max_parallel_downloads 调整
+MEDIA_DOWNLOAD_CONCURRENCY = 5
+MAX_MEDIA_DOWNLOAD_CONCURRENCY = 16
+
 
 class ProcessedBatchData(TypedDict):
     """分发阶段可直接消费的批次数据结构。
@@ -106,6 +113,69 @@ def message_expects_downloadable_media(msg: Message) -> bool:
     )
 
 
+def media_download_semaphore(sender: "QQSender") -> asyncio.Semaphore:
+    """按 forward_config.max_parallel_downloads 创建媒体下载并发信号量。"""
+    forward_cfg = sender.config.get("forward_config", {})
+    concurrency = min(
+        MAX_MEDIA_DOWNLOAD_CONCURRENCY,
+        positive_int(
+            forward_cfg.get("max_parallel_downloads", MEDIA_DOWNLOAD_CONCURRENCY),
+            MEDIA_DOWNLOAD_CONCURRENCY,
+        ),
+    )
+    return asyncio.Semaphore(concurrency)
+
+
+async def download_batch_media(
+    sender: "QQSender",
+    msgs: list[Message],
+    semaphore: asyncio.Semaphore | None = None,
+) -> list[list[str]]:
+    """并发下载一个批次内所有消息的媒体，结果与 msgs 一一对应。
+
+    任一下载抛出异常时，先清理其余已落盘的文件再把异常抛给调用方。
+    传入 semaphore 时与其它批次共享同一个并发上限。
+    """
+    if semaphore is None:
+        semaphore = media_download_semaphore(sender)
+
+    async def download_one(msg: Message) -> list[str]:
+        async with semaphore:
+            return await sender.downloader.download_media(
+                msg, max_size_mb=getattr(msg, "_max_file_size", 0)
+            )
+
+    results = await asyncio.gather(
+        *(download_one(msg) for msg in msgs), return_exceptions=True
+    )
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        sender._schedule_cleanup_files(
+            [fpath for r in results if not isinstance(r, BaseException) for fpath in r]
+        )
+        raise errors[0]
+    return results
+
+
+async def _discard_download_tasks(
+    sender: "QQSender",
+    download_tasks: list[asyncio.Task],
+    consumed: set[int],
+) -> None:
+    """取消未完成的下载，并清理已落盘却没被组装使用的文件。"""
+    pending = [task for task in download_tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    for index, task in enumerate(download_tasks):
+        if index in consumed or task.cancelled() or task.exception() is not None:
+            continue
+        sender._schedule_cleanup_files(
+            [fpath for files in task.result() for fpath in files]
+        )
+
+
 async def build_processed_batches(
     *,
     sender: "QQSender",
@@ -145,123 +215,141 @@ async def build_processed_batches(
     target_failures: dict[int, str] = {}
     header_added = False
 
-    for batch_index, msgs in enumerate(real_batches):
-        all_local_files = []
-        all_nodes_data = []
-        media_download_failed = False
-        batch_header_added = False
-        header_added_before_batch = header_added
-        try:
-            reply_preview_cache = await sender._prefetch_reply_previews(
-                msgs, src_channel, strip_links=strip_links
-            )
-            for i, msg in enumerate(msgs):
-                current_node_components = []
-                text_parts = []
-                if msg.text:
-                    cleaned = clean_telegram_text(msg.text, strip_links=strip_links)
-                    if cleaned:
-                        text_parts.append(cleaned)
-
-                media_components = []
-                has_any_attachment = False
-                msg_max_size = getattr(msg, "_max_file_size", 0)
-                expects_media = message_expects_downloadable_media(msg)
-                files = await sender.downloader.download_media(
-                    msg, max_size_mb=msg_max_size
+    # 所有批次的媒体下载同时启动、共享并发上限；节点组装仍按批次顺序进行，
+    # 头部位置与批次原子失败的语义不变。
+    semaphore = media_download_semaphore(sender)
+    download_tasks = [
+        asyncio.ensure_future(download_batch_media(sender, msgs, semaphore))
+        for msgs in real_batches
+    ]
+    consumed_downloads: set[int] = set()
+    try:
+        for batch_index, msgs in enumerate(real_batches):
+            all_local_files = []
+            all_nodes_data = []
+            media_download_failed = False
+            # 组装节点时顺带记录是否含语音，免得构建完再整批扫描一遍
+            contains_audio = False
+            batch_header_added = False
+            header_added_before_batch = header_added
+            try:
+                reply_preview_cache = await sender._prefetch_reply_previews(
+                    msgs, src_channel, strip_links=strip_links
                 )
-                if expects_media and not files:
-                    media_download_failed = True
-                    logger.warning(
-                        f"[QQSender] 消息 {getattr(msg, 'id', '?')} 媒体下载失败，"
-                        "跳过整条（不发送纯文字 caption）"
-                    )
-                    continue
-                for fpath in files:
-                    all_local_files.append(fpath)
-                    has_any_attachment = True
-                    media_components.extend(sender._dispatch_media_file(fpath))
-
-                should_exclude_text = exclude_text_on_media and has_any_attachment
-
-                reply_header = getattr(msg, "reply_to", None)
-                reply_id = getattr(reply_header, "reply_to_msg_id", None)
-                reply_preview = None
-                if reply_id is not None:
-                    reply_preview = reply_preview_cache.get(reply_id)
-                if reply_preview and not should_exclude_text:
-                    text_parts.insert(0, reply_preview)
-
-                # 头部只在“第一条真正发出的消息”前加一次。
-                # 不能用原始 i==0：首条若因媒体下载失败被跳过，后续成功消息仍需 From 头。
-                # 也不能在“仅 header 节点”被丢弃前就把 flag 置 True。
-                add_header_this_time = False
-                if not should_exclude_text:
-                    if involved_channels and len(involved_channels) > 1:
-                        if not header_added:
-                            add_header_this_time = True
-                    elif not batch_header_added:
-                        add_header_this_time = True
-
-                if add_header_this_time:
-                    if text_parts:
-                        text_parts[0] = f"{header}\n​{text_parts[0]}"
-                    else:
-                        current_node_components.append(Plain(f"{header}\n​"))
-
-                if not should_exclude_text:
-                    for t in text_parts:
-                        current_node_components.append(Plain(t + "\n"))
-
-                # 部分特殊媒体（视频、语音、文件）在 QQ 侧和纯文本混发时表现不稳定，
-                # 因此这里会把“文本节点”和“特殊媒体节点”拆开，降低发送失败概率。
-                _node_special_media = [
-                    c for c in media_components if isinstance(c, (Video, Record, File))
-                ]
-                if not should_exclude_text and text_parts and _node_special_media:
-                    if current_node_components:
-                        all_nodes_data.append(current_node_components)
-                        if add_header_this_time:
-                            header_added = True
-                            batch_header_added = True
-                        add_header_this_time = False
+                consumed_downloads.add(batch_index)
+                files_per_msg = await download_tasks[batch_index]
+                # 下载结果先整体登记，组装中途出错时也能一并清理
+                all_local_files = [fpath for files in files_per_msg for fpath in files]
+                for i, msg in enumerate(msgs):
                     current_node_components = []
+                    text_parts = []
+                    if msg.text:
+                        cleaned = clean_telegram_text(msg.text, strip_links=strip_links)
+                        if cleaned:
+                            text_parts.append(cleaned)
+
+                    media_components = []
+                    has_any_attachment = False
+                    expects_media = message_expects_downloadable_media(msg)
+                    files = files_per_msg[i]
+                    if expects_media and not files:
+                        media_download_failed = True
+                        logger.warning(
+                            f"[QQSender] 消息 {getattr(msg, 'id', '?')} 媒体下载失败，"
+                            "跳过整条（不发送纯文字 caption）"
+                        )
+                        continue
+                    for fpath in files:
+                        has_any_attachment = True
+                        file_components = sender._dispatch_media_file(fpath)
+                        if not contains_audio:
+                            contains_audio = any(
+                                isinstance(c, Record) for c in file_components
+                            )
+                        media_components.extend(file_components)
+
+                    should_exclude_text = exclude_text_on_media and has_any_attachment
+
+                    reply_header = getattr(msg, "reply_to", None)
+                    reply_id = getattr(reply_header, "reply_to_msg_id", None)
+                    reply_preview = None
+                    if reply_id is not None:
+                        reply_preview = reply_preview_cache.get(reply_id)
+                    if reply_preview and not should_exclude_text:
+                        text_parts.insert(0, reply_preview)
+
+                    # 头部只在“第一条真正发出的消息”前加一次。
+                    # 不能用原始 i==0：首条若因媒体下载失败被跳过，后续成功消息仍需 From 头。
+                    # 也不能在“仅 header 节点”被丢弃前就把 flag 置 True。
+                    add_header_this_time = False
+                    if not should_exclude_text:
+                        if involved_channels and len(involved_channels) > 1:
+                            if not header_added:
+                                add_header_this_time = True
+                        elif not batch_header_added:
+                            add_header_this_time = True
 
-                current_node_components.extend(media_components)
-
-                if current_node_components:
-                    is_only_header = (
-                        len(current_node_components) == 1
-                        and isinstance(current_node_components[0], Plain)
-                        and current_node_components[0].text.strip("​\n") in [header, ""]
+                    if add_header_this_time:
+                        if text_parts:
+                            text_parts[0] = f"{header}\n​{text_parts[0]}"
+                        else:
+                            current_node_components.append(Plain(f"{header}\n​"))
+
+                    if not should_exclude_text:
+                        for t in text_parts:
+                            current_node_components.append(Plain(t + "\n"))
+
+                    # 部分特殊媒体（视频、语音、文件）在 QQ 侧和纯文本混发时表现不稳定，
+                    # 因此这里会把“文本节点”和“特殊媒体节点”拆开，降低发送失败概率。
+                    _node_special_media = [
+                        c
+                        for c in media_components
+                        if isinstance(c, (Video, Record, File))
+                    ]
+                    if not should_exclude_text and text_parts and _node_special_media:
+                        if current_node_components:
+                            all_nodes_data.append(current_node_components)
+                            if add_header_this_time:
+                                header_added = True
+                                batch_header_added = True
+                            add_header_this_time = False
+                        current_node_components = []
+
+                    current_node_components.extend(media_components)
+
+                    # 本条既无文本也无媒体时节点里只剩头部，结构上即可判定，无需比对文本
+                    header_only = (
+                        add_header_this_time and not text_parts and not media_components
                     )
-                    if not is_only_header:
+                    if current_node_components and not header_only:
                         all_nodes_data.append(current_node_components)
                         if add_header_this_time:
                             header_added = True
                             batch_header_added = True
 
-            if media_download_failed:
-                # 一个逻辑批次必须原子发送。若只发送成功构建的部分，发送汇总会把
-                # 整个 batch_index 标为成功，失败媒体随后将从 pending 中永久丢失。
-                sender._cleanup_files(all_local_files)
-                header_added = header_added_before_batch
-                target_failures.setdefault(batch_index, "media_download_failed")
-            elif all_nodes_data:
-                processed_batches.append(
-                    ProcessedBatch(
-                        batch_index=batch_index,
-                        nodes_data=all_nodes_data,
-                        local_files=all_local_files,
-                        contains_audio=sender._batch_contains_audio(all_nodes_data),
-                    ).as_batch_data()
-                )
-            else:
-                target_failures.setdefault(batch_index, "preprocess_empty")
-        except Exception as e:
-            logger.error(f"[QQSender] 预处理消息批次异常: {e}")
-            target_failures.setdefault(batch_index, sender._classify_send_error(e))
-            sender._cleanup_files(all_local_files)
+                if media_download_failed:
+                    # 一个逻辑批次必须原子发送。若只发送成功构建的部分，发送汇总会把
+                    # 整个 batch_index 标为成功，失败媒体随后将从 pending 中永久丢失。
+                    sender._schedule_cleanup_files(all_local_files)
+                    header_added = header_added_before_batch
+                    target_failures.setdefault(batch_index, "media_download_failed")
+                elif all_nodes_data:
+                    processed_batches.append(
+                        ProcessedBatch(
+                            batch_index=batch_index,
+                            nodes_data=all_nodes_data,
+                            local_files=all_local_files,
+                            contains_audio=contains_audio,
+                        ).as_batch_data()
+                    )
+                else:
+                    target_failures.setdefault(batch_index, "preprocess_empty")
+            except Exception as e:
+                logger.error(f"[QQSender] 预处理消息批次异常: {e}")
+                target_failures.setdefault(batch_index, sender._classify_send_error(e))
+                sender._schedule_cleanup_files(all_local_files)
+    finally:
+        await _discard_download_tasks(sender, download_tasks, consumed_downloads)
 
     return BuildBatchesResult(
         processed_batches=processed_batches,
@@ -15,10 +15,12 @@ from typing import Protocol
 
 from astrbot.api import logger
 from astrbot.api.event import MessageChain
-from astrbot.api.message_components import File, Node, Nodes, Record, Video
+from astrbot.api.message_components import File, Image, Node, Nodes, Record, Video
 
 from .qq_batch_builder import ProcessedBatchData
 from .qq_media import _patch_file_to_dict
+from .qq_rate_limit import TokenBucket, resolve_send_burst
+from .qq_send_prep import positive_int
 from .qq_types import SendMessageFn
 
 PROBABLE_DELIVERY_ERROR_TYPES = {"sendmsg_confirmation_timeout"}
@@ -30,6 +32,9 @@ DEFAULT_BIG_MERGE_MAX_ATTEMPTS = 2
 DEFAULT_BIG_MERGE_RETRY_DELAY = 2.0
 MAX_BIG_MERGE_ATTEMPTS = 5
 MAX_BIG_MERGE_RETRY_DELAY = 60.0
+DEFAULT_BATCH_SEND_INTERVAL = 1.0
+DEFAULT_TARGET_CONCURRENCY = 5
+MAX_BATCH_SEND_INTERVAL = 30.0
 
 
 def _resolve_big_merge_retry_policy(forward_cfg: dict) -> tuple[int, float]:
@@ -61,6 +66,26 @@ def _resolve_big_merge_retry_policy(forward_cfg: dict) -> tuple[int, float]:
     return max_attempts, retry_delay
 
 
+def _resolve_batch_send_interval(forward_cfg: dict) -> float:
+    """解析普通发送模式下同一目标相邻批次之间的间隔（秒）。"""
+    raw_interval = forward_cfg.get(
+        "qq_batch_send_interval", DEFAULT_BATCH_SEND_INTERVAL
+    )
+    try:
+        interval = float(raw_interval)
+    except (TypeError, ValueError, OverflowError):
+        interval = DEFAULT_BATCH_SEND_INTERVAL
+    if not math.isfinite(interval):
+        interval = DEFAULT_BATCH_SEND_INTERVAL
+    return min(MAX_BATCH_SEND_INTERVAL, max(0.0, interval))
+
+
+def _failure_backoff(interval: float, consecutive_failures: int) -> float:
+    """连续失败后的退避时长：以批次间隔（至少默认值）为基数指数增长。"""
+    base = max(interval, DEFAULT_BATCH_SEND_INTERVAL)
+    return min(MAX_BATCH_SEND_INTERVAL, base * 2 ** max(0, consecutive_failures))
+
+
 def _is_big_merge_retryable(error_type: str) -> bool:
     return error_type in BIG_MERGE_RETRYABLE_ERROR_TYPES
 
@@ -127,23 +152,58 @@ async def dispatch_processed_batches_to_targets(
     fail_fast_limit: int,
     target_circuit_fail_threshold: int,
     target_circuit_cooldown_sec: int,
+    get_send_bucket: Callable[[str], TokenBucket] | None = None,
     log_policy: object | None = None,
 ) -> DispatchResult:
     """把预处理后的批次发送到每一个 QQ 目标会话。
 
     这里是发送策略的核心入口：
-    - 逐目标加锁，避免同一群并发写入
+    - 各目标并发发送，逐目标加锁，避免同一群并发写入
     - 熔断目标直接跳过并标记延后
     - 满足条件时走大合并发送，提高吞吐
     - 大合并失败后自动降级为逐批发送
     - 连续失败达到阈值后对当前目标快速止损
     """
+    # 分块与重试参数、分块结果对所有目标相同，只计算一次
+    chunk_size = forward_cfg.get("qq_merge_chunk_size", 5)
+    chunk_delay = forward_cfg.get("qq_merge_chunk_delay", 3)
+    big_merge_max_attempts, big_merge_retry_delay = _resolve_big_merge_retry_policy(
+        forward_cfg
+    )
+    batch_send_interval = _resolve_batch_send_interval(forward_cfg)
+    # 令牌桶稳态速率沿用批次间隔（间隔为 0 即不限速），突发容量由 qq_send_burst 控制
+    send_rate = 1.0 / batch_send_interval if batch_send_interval > 0 else 0.0
+    send_burst = resolve_send_burst(forward_cfg)
+    # 同时下发的目标数上限，避免目标很多时瞬间把所有群一起打满触发风控
+    target_semaphore = asyncio.Semaphore(
+        positive_int(
+            forward_cfg.get("qq_target_concurrency", DEFAULT_TARGET_CONCURRENCY),
+            DEFAULT_TARGET_CONCURRENCY,
+        )
+    )
+    # 按批次边界拆块，避免同一组图片 / 相册 / 回复上下文被拆到不同块
+    batch_chunks: list[list[ProcessedBatchData]] = []
+    if use_big_merge or is_mixed_big_merge:
+        current_chunk_batches: list[ProcessedBatchData] = []
+        current_chunk_nodes = 0
+        for batch_data in processed_batches:
+            batch_node_count = len(batch_data["nodes_data"])
+            if (
+                current_chunk_nodes + batch_node_count > chunk_size
+                and current_chunk_batches
+            ):
+                batch_chunks.append(current_chunk_batches)
+                current_chunk_batches = []
+                current_chunk_nodes = 0
+            current_chunk_batches.append(batch_data)
+            current_chunk_nodes += batch_node_count
+        if current_chunk_batches:
+            batch_chunks.append(current_chunk_batches)
 
-    for target_session in context_target_sessions:
-        if not target_session:
-            continue
+    async def dispatch_to_target(target_session: str) -> None:
         lock = get_lock(target_session)
-        async with lock:
+        # 先拿目标锁再占并发名额：等待繁忙目标时不占用名额，避免拖住其它目标
+        async with lock, target_semaphore:
             now_ts = time.time()
             if target_is_open(target_session, now_ts):
                 pending_batch_indexes = {
@@ -152,40 +212,17 @@ async def dispatch_processed_batches_to_targets(
                     if target_session not in target_successes.get(batch_index, set())
                 }
                 if not pending_batch_indexes:
-                    continue
+                    return
                 logger.warning(
                     f"[QQSender] 目标 {target_session} 熔断冷却中，跳过本轮发送"
                 )
                 deferred_batch_indexes.update(pending_batch_indexes)
-                continue
+                return
 
             unified_msg_origin = target_session
 
             if use_big_merge or is_mixed_big_merge:
                 # ─── 大合并（包括混合模式） ───
-                # 按批次边界拆块，避免同一组图片 / 相册 / 回复上下文被拆到不同块
-                chunk_size = forward_cfg.get("qq_merge_chunk_size", 5)
-                chunk_delay = forward_cfg.get("qq_merge_chunk_delay", 3)
-                big_merge_max_attempts, big_merge_retry_delay = (
-                    _resolve_big_merge_retry_policy(forward_cfg)
-                )
-                batch_chunks: list[list[ProcessedBatchData]] = []
-                current_chunk_batches: list[ProcessedBatchData] = []
-                current_chunk_nodes = 0
-                for batch_data in processed_batches:
-                    batch_node_count = len(batch_data["nodes_data"])
-                    if (
-                        current_chunk_nodes + batch_node_count > chunk_size
-                        and current_chunk_batches
-                    ):
-                        batch_chunks.append(current_chunk_batches)
-                        current_chunk_batches = []
-                        current_chunk_nodes = 0
-                    current_chunk_batches.append(batch_data)
-                    current_chunk_nodes += batch_node_count
-                if current_chunk_batches:
-                    batch_chunks.append(current_chunk_batches)
-
                 total_chunks = len(batch_chunks)
                 consecutive_failures = 0
                 for chunk_idx, chunk_batches in enumerate(batch_chunks, 1):
@@ -284,14 +321,15 @@ async def dispatch_processed_batches_to_targets(
                     last_big_merge_error: Exception | None = None
                     last_big_merge_error_type = "send_failed"
                     attempts_used = 0
+                    # 节点包装与重试次数无关，构建一次后各次重试复用
+                    nodes_list = [
+                        Node(uin=self_id, name=node_name, content=nc)
+                        for nc in chunk_nodes
+                    ]
                     for attempt in range(1, big_merge_max_attempts + 1):
                         attempts_used = attempt
                         try:
                             if len(chunk_nodes) > 1:
-                                nodes_list = [
-                                    Node(uin=self_id, name=node_name, content=nc)
-                                    for nc in chunk_nodes
-                                ]
                                 message_chain = MessageChain()
                                 message_chain.chain.append(Nodes(nodes_list))
                                 await send_message_fn(
@@ -467,11 +505,22 @@ async def dispatch_processed_batches_to_targets(
                         await asyncio.sleep(chunk_delay)
             else:
                 # 普通发送（逐个小相册 / 单条）
+                # 成功路径由逐目标令牌桶限速，发送耗时计入补充时间；未提供桶时退回固定间隔。
+                # 失败后按连续失败次数指数退避。
+                bucket = get_send_bucket(target_session) if get_send_bucket else None
+                if bucket is not None:
+                    bucket.configure(send_rate, send_burst)
+                success_delay = 0.0 if bucket is not None else batch_send_interval
                 consecutive_failures = 0
+                pending_delay = 0.0
                 for batch_data in processed_batches:
                     batch_index = batch_data["batch_index"]
                     if target_session in target_successes.get(batch_index, set()):
                         continue
+                    if pending_delay > 0:
+                        await asyncio.sleep(pending_delay)
+                    if bucket is not None:
+                        await bucket.acquire()
                     try:
                         await send_processed_batch_fn(
                             batch_data=batch_data,
@@ -484,7 +533,7 @@ async def dispatch_processed_batches_to_targets(
                         target_successes[batch_index].add(target_session)
                         record_target_success(target_session)
                         consecutive_failures = 0
-                        await asyncio.sleep(1)
+                        pending_delay = success_delay
                     except Exception as e:
                         error_type = classify_send_error(e)
                         if _is_probably_delivered(error_type):
@@ -496,7 +545,7 @@ async def dispatch_processed_batches_to_targets(
                                 f"按已送达处理: batch_index={batch_index}, "
                                 f"target={target_session}, error={e!r}"
                             )
-                            await asyncio.sleep(1)
+                            pending_delay = success_delay
                             continue
                         consecutive_failures += 1
                         target_failures.setdefault(
@@ -515,6 +564,22 @@ async def dispatch_processed_batches_to_targets(
                                 f"[QQSender] 目标 {target_session} 连续失败 {consecutive_failures} 次，停止本目标后续批次"
                             )
                             break
+                        pending_delay = _failure_backoff(
+                            batch_send_interval, consecutive_failures
+                        )
+
+    # 不同目标之间互不依赖，并发下发；同一目标内仍由锁与批次间隔保证顺序
+    results = await asyncio.gather(
+        *(
+            dispatch_to_target(target_session)
+            for target_session in dict.fromkeys(context_target_sessions)
+            if target_session
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
 
     return DispatchResult(
         target_successes=target_successes,
@@ -639,12 +704,23 @@ async def send_processed_batch(
                 return
             chain = MessageChain()
             chain.chain.extend(components)
+            # 合并后的积压节点可能带多张图片，按媒体发送计算超时，避免大图被纯文本超时截断
+            has_image = any(isinstance(c, Image) for c in components)
             await send_message_fn(
                 unified_msg_origin,
                 chain,
-                send_kind="plain",
+                send_kind="image_batch" if has_image else "plain",
             )
 
+        async def send_deferred_nodes(nodes: list[list]) -> None:
+            # 只有文字/图片的积压节点合成一条消息发出，减少往返次数；
+            # 含文件/视频的节点与文本混发不稳定，仍逐节点发送
+            if any(isinstance(c, (File, Video)) for node in nodes for c in node):
+                for node in nodes:
+                    await send_common_components(node)
+                return
+            await send_common_components([c for node in nodes for c in node])
+
         deferred_common_nodes = []
         for node_components in all_nodes_data:
             common_components = []
@@ -652,10 +728,10 @@ async def send_processed_batch(
             for component in node_components:
                 if isinstance(component, Record):
                     sent_audio = True
-                    for deferred_components in deferred_common_nodes:
-                        await send_common_components(deferred_components)
+                    await send_deferred_nodes(
+                        [*deferred_common_nodes, common_components]
+                    )
                     deferred_common_nodes.clear()
-                    await send_common_components(common_components)
                     common_components.clear()
 
                     path = getattr(component, "path", None)
@@ -673,7 +749,9 @@ async def send_processed_batch(
                             f"[QQSender] 语音条发送失败，继续发送源文件: target={target_session}, error_type={type(e).__name__}, error={e!r}"
                         )
                     if path:
-                        mapped = map_path(path)
+                        mapped = getattr(
+                            component, "_tgf_mapped_path", None
+                        ) or map_path(path)
                         file_component = build_file_component(
                             name=Path(path).name,
                             file_path=mapped,
@@ -702,8 +780,7 @@ async def send_processed_batch(
                 continue
             if common_components:
                 deferred_common_nodes.append(common_components)
-        for deferred_components in deferred_common_nodes:
-            await send_common_components(deferred_components)
+        await send_deferred_nodes(deferred_common_nodes)
         if log_policy is not None:
             log_policy.log_audio_split(
                 node_name=node_name,
@@ -804,7 +881,9 @@ async def send_processed_batch(
                                 )
                                 raise
                             if path:
-                                mapped = map_path(path)
+                                mapped = getattr(
+                                    c, "_tgf_mapped_path", None
+                                ) or map_path(path)
                                 logger.warning(
                                     f"[QQSender] 视频发送失败，继续发送源文件: target={target_session}, "
                                     f"source_path={path!r}, mapped_path={mapped!r}, "
@@ -5,6 +5,7 @@
 """
 
 from collections.abc import Callable
+from pathlib import Path
 
 from astrbot.api import logger
 
@@ -54,21 +55,25 @@ class QQLogPolicy:
         mapped_path: str,
         file: object,
         ext: str,
-        file_size: int | None,
         mapped_changed: bool,
     ) -> None:
         """视频分发准备完成的详细日志（debug 模式下才输出）。
 
+        文件大小只在确实输出日志时才 stat，非 debug 模式下不产生额外系统调用。
+
         Args:
             source_path: 原始视频文件路径。
             mapped_path: 映射后的文件路径。
             file: Video 组件的 file 属性。
             ext: 文件扩展名。
-            file_size: 文件大小（字节）。
             mapped_changed: 映射路径是否与原始路径不同。
         """
         if not self._debug_enabled():
             return
+        try:
+            file_size: int | None = Path(source_path).stat().st_size
+        except OSError:
+            file_size = None
         logger.info(
             f"[QQSender] Video dispatch prepared: source_path={source_path!r}, "
             f"mapped_path={mapped_path!r}, file={file!r}, "
@@ -20,6 +20,13 @@ _ = Plain
 
 _logged_path_mapping_states: set[str] = set()
 
+# 后缀 → 媒体类别，一次查表即可决定组件类型；未列出的后缀按普通文件发送
+_MEDIA_KIND_BY_EXT = {
+    **dict.fromkeys((".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"), "image"),
+    **dict.fromkeys((".wav", ".mp3", ".flac", ".ogg", ".m4a", ".aac"), "audio"),
+    **dict.fromkeys((".mp4", ".mkv", ".mov", ".webm", ".avi"), "video"),
+}
+
 
 def _set_component_attr(component: object, name: str, value: object) -> None:
     """尽力向消息组件附加元数据，兼容宽松/严格两种模型。"""
@@ -264,9 +271,10 @@ def dispatch_media_file(
     """
     path_obj = Path(fpath)
     ext = path_obj.suffix.lower()
-    if ext in (".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"):
+    kind = _MEDIA_KIND_BY_EXT.get(ext, "file")
+    if kind == "image":
         return [Image.fromFileSystem(fpath)]
-    if ext in (".wav", ".mp3", ".flac", ".ogg", ".m4a", ".aac"):
+    if kind == "audio":
         if audio_mode == "file_only":
             mapped = map_path(fpath)
             component = _patch_file_to_dict(
@@ -280,26 +288,28 @@ def dispatch_media_file(
             return [component]
         # aiocqhttp 会在 AstrBot 进程内把 Record 转为 base64，
         # 因此 Record.file 必须保持为 AstrBot 宿主机可读取的路径。
-        # 映射后的路径仍会在后续发送源文件兜底时使用。
+        # 映射后的路径仍会在后续发送源文件兜底时使用，这里算好挂在组件上，
+        # 多个目标补发时不必各自重新解析路径映射配置。
         record = Record.fromFileSystem(fpath)
         if getattr(record, "path", None) is None:
             setattr(record, "path", fpath)
         _set_component_attr(record, "_tgf_source_path", fpath)
+        _set_component_attr(record, "_tgf_mapped_path", map_path(fpath))
         return [record]
-    if ext in (".mp4", ".mkv", ".mov", ".webm", ".avi"):
+    if kind == "video":
         mapped = map_path(fpath)
         if mapped != fpath:
             video = Video(file=_as_file_uri(mapped))
         else:
             video = Video.fromFileSystem(fpath)
         _set_component_attr(video, "_tgf_source_path", fpath)
+        _set_component_attr(video, "_tgf_mapped_path", mapped)
         if log_policy is not None:
             log_policy.log_video_dispatch_prepared(
                 source_path=fpath,
                 mapped_path=mapped,
                 file=getattr(video, "file", None),
                 ext=ext,
-                file_size=_safe_file_size(fpath),
                 mapped_changed=mapped != fpath,
             )
         else:
@@ -357,13 +367,6 @@ def _patch_file_to_dict(f: File) -> File:
     return f
 
 
-def batch_contains_audio(nodes_data: list[list[object]]) -> bool:
-    """判断批次节点中是否包含语音组件。"""
-    return any(
-        isinstance(component, Record) for node in nodes_data for component in node
-    )
-
-
 def should_merge_batch_nodes(batch_data: ProcessedBatchData) -> bool:
     """判断一个批次是否适合按合并转发节点发送。
 
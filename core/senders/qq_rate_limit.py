@@ -0,0 +1,65 @@
+"""QQ 目标会话的发送限速。
+
+普通发送模式原先在每批成功后固定 `sleep(间隔)`，发送本身耗时再长也要额外等待。
+这里改用按目标会话维护的令牌桶：稳态速率仍由批次间隔决定，但发送耗时会计入补充时间，
+并允许通过 `qq_send_burst` 放行少量突发批次。桶挂在 `QQSender` 上，跨多次 `send()` 复用，
+已补满且无人使用的桶会被回收。
+"""
+
+import asyncio
+import time
+
+DEFAULT_SEND_BURST = 1
+MAX_SEND_BURST = 10
+
+
+class TokenBucket:
+    """单个目标会话的令牌桶。`rate <= 0` 表示不限速。"""
+
+    __slots__ = ("rate", "capacity", "tokens", "last")
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+
+    def configure(self, rate: float, capacity: int) -> None:
+        """热更新速率与容量；已积累的令牌不超过新容量。"""
+        self._refill(time.monotonic())
+        self.rate = rate
+        self.capacity = float(capacity)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.last) * self.rate
+            )
+        else:
+            self.tokens = self.capacity
+        self.last = now
+
+    def is_full(self, now: float) -> bool:
+        """按当前时间推算令牌是否已补满；补满的桶与新建的桶等价，可以丢弃。"""
+        if self.rate <= 0:
+            return True
+        return self.tokens + (now - self.last) * self.rate >= self.capacity
+
+    async def acquire(self) -> None:
+        """取走一个令牌；不足时按缺口等待补充。"""
+        while True:
+            self._refill(time.monotonic())
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+def resolve_send_burst(forward_cfg: dict) -> int:
+    """解析 `qq_send_burst`：同一目标可连续放行的批次数。"""
+    try:
+        burst = int(forward_cfg.get("qq_send_burst", DEFAULT_SEND_BURST))
+    except (TypeError, ValueError, OverflowError):
+        burst = DEFAULT_SEND_BURST
+    return min(MAX_SEND_BURST, max(1, burst))
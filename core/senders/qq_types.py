@@ -8,6 +8,7 @@ SendKind = Literal[
     "big_merge",
     "album_merge",
     "plain",
+    "image_batch",
     "audio_record",
     "audio_file",
     "video_file",
@@ -1,12 +1,15 @@
 import asyncio
 import filecmp
 import hashlib
+import os
 import shutil
+import stat
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
 from astrbot.api import AstrBotConfig, logger, star
 from astrbot.api.event import AstrMessageEvent, filter
 from astrbot.api.web import error_response, json_response, request
@@ -54,7 +57,7 @@ class Main(star.Star):
             candidate.relative_to(plugin_dir)
         except ValueError:
             return None
-        if candidate.suffix != ".session" or not candidate.is_file():
+        if candidate.suffix != ".session":
             return None
         return str(candidate)
 
@@ -78,11 +81,35 @@ class Main(star.Star):
         return digest.hexdigest()
 
     @staticmethod
-    def _write_session_source_marker(marker_path: Path, digest: str) -> None:
+    def _session_stat_signature(file_stat: os.stat_result) -> str:
+        """返回文件的大小与修改时间签名，用于启动时免哈希判断文件是否变化。"""
+        return f"{file_stat.st_size}:{file_stat.st_mtime_ns}"
+
+    @staticmethod
+    def _read_session_source_marker(marker_path: Path) -> tuple[str, str]:
+        """读取同步指纹，返回 (SHA-256, 大小/修改时间签名)。
+
+        旧版本指纹只有摘要一行，此时签名为空串。
+        """
+        try:
+            lines = marker_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return "", ""
+        except Exception as e:
+            logger.warning(f"[Main] 读取会话同步指纹失败: {e}")
+            return "", ""
+        digest = lines[0].strip() if lines else ""
+        signature = lines[1].strip() if len(lines) > 1 else ""
+        return digest, signature
+
+    @staticmethod
+    def _write_session_source_marker(
+        marker_path: Path, digest: str, stat_signature: str = ""
+    ) -> None:
         """原子写入上传会话文件的同步指纹（.tmp + replace）。"""
         try:
             tmp_path = marker_path.with_name(marker_path.name + ".tmp")
-            tmp_path.write_text(digest, encoding="utf-8")
+            tmp_path.write_text(f"{digest}\n{stat_signature}", encoding="utf-8")
             tmp_path.replace(marker_path)
         except Exception as e:
             logger.warning(f"[Main] 写入会话同步指纹失败: {e}")
@@ -91,6 +118,7 @@ class Main(star.Star):
         self,
         marker_path: Path,
         uploaded_digest: str,
+        uploaded_signature: str,
         full_uploaded_path: str,
         target_session_path: Path,
     ) -> bool:
@@ -103,27 +131,30 @@ class Main(star.Star):
         Args:
             marker_path: 同步指纹文件路径。
             uploaded_digest: 上传文件当前内容的 SHA-256。
+            uploaded_signature: 上传文件当前的大小/修改时间签名。
             full_uploaded_path: 上传文件的绝对路径。
             target_session_path: 目标会话文件路径。
 
         Returns:
             True 表示可跳过本次同步。
         """
-        try:
-            if (
-                marker_path.exists()
-                and marker_path.read_text(encoding="utf-8").strip() == uploaded_digest
-            ):
-                logger.debug("[Main] 上传会话文件与上次同步一致，跳过同步。")
-                return True
-        except Exception as e:
-            logger.warning(f"[Main] 读取会话同步指纹失败: {e}")
+        marker_digest, marker_signature = self._read_session_source_marker(marker_path)
+        if marker_digest == uploaded_digest:
+            logger.debug("[Main] 上传会话文件与上次同步一致，跳过同步。")
+            if marker_signature != uploaded_signature:
+                # 内容未变但签名过期（如文件被 touch），刷新后下次启动可免哈希
+                self._write_session_source_marker(
+                    marker_path, uploaded_digest, uploaded_signature
+                )
+            return True
 
         try:
             if filecmp.cmp(full_uploaded_path, target_session_path, shallow=False):
                 logger.debug("[Main] 会话文件未变化，跳过同步。")
                 # 为存量部署补写指纹，让后续的 schema 自愈不再触发回拷。
-                self._write_session_source_marker(marker_path, uploaded_digest)
+                self._write_session_source_marker(
+                    marker_path, uploaded_digest, uploaded_signature
+                )
                 return True
         except Exception as e:
             logger.warning(f"[Main] 比较会话文件失败: {e}")
@@ -141,7 +172,14 @@ class Main(star.Star):
 
         uploaded_session_path = session_files[0]
         full_uploaded_path = self._resolve_uploaded_session_path(uploaded_session_path)
-        if not full_uploaded_path:
+        # 存在性与签名共用一次 stat，不再先 is_file() 再单独取大小/修改时间
+        uploaded_stat = None
+        if full_uploaded_path:
+            try:
+                uploaded_stat = os.stat(full_uploaded_path)
+            except OSError:
+                uploaded_stat = None
+        if uploaded_stat is None or not stat.S_ISREG(uploaded_stat.st_mode):
             logger.warning(
                 f"[Main] 配置中的会话文件路径不存在: {uploaded_session_path}"
             )
@@ -149,6 +187,15 @@ class Main(star.Star):
 
         target_session_path = self.plugin_data_dir / "user_session.session"
         marker_path = self.plugin_data_dir / "user_session.session.source.sha256"
+        uploaded_signature = self._session_stat_signature(uploaded_stat)
+
+        # 大小与修改时间都与上次同步时一致，说明上传文件未被替换，不必整文件哈希
+        target_exists = target_session_path.exists()
+        if target_exists:
+            _, marker_signature = self._read_session_source_marker(marker_path)
+            if marker_signature == uploaded_signature:
+                logger.debug("[Main] 上传会话文件签名未变化，跳过同步。")
+                return
 
         try:
             uploaded_digest = self._file_sha256(full_uploaded_path)
@@ -156,14 +203,20 @@ class Main(star.Star):
             logger.warning(f"[Main] 读取上传会话文件失败: {e}")
             return
 
-        if target_session_path.exists() and self._is_uploaded_session_already_synced(
-            marker_path, uploaded_digest, full_uploaded_path, target_session_path
+        if target_exists and self._is_uploaded_session_already_synced(
+            marker_path,
+            uploaded_digest,
+            uploaded_signature,
+            full_uploaded_path,
+            target_session_path,
         ):
             return
 
         try:
             shutil.copyfile(full_uploaded_path, target_session_path)
-            self._write_session_source_marker(marker_path, uploaded_digest)
+            self._write_session_source_marker(
+                marker_path, uploaded_digest, uploaded_signature
+            )
             logger.debug(f"[Main] 已从上传配置同步会话文件: {target_session_path}")
             # 客户端缓存键使用不带 .session 后缀的 user_session。
             session_key_path = self.plugin_data_dir / "user_session"
@@ -743,14 +796,19 @@ class Main(star.Star):
         check_interval = forward_config.get("check_interval", 60)
         send_interval = forward_config.get("send_interval", 60)
 
+        # 抓取与发送周期常配置成相同值，加少量抖动错开唤醒，避免两者每轮同时抢 Telethon；
+        # 宽限期内的延迟执行照常补跑，而不是被 APScheduler 当作 misfire 丢弃。
         check_start_time = datetime.now() + timedelta(seconds=startup_grace)
         self.scheduler.add_job(
             self._run_check_updates_job,
-            "interval",
-            seconds=check_interval,
+            trigger=IntervalTrigger(
+                seconds=check_interval,
+                start_date=check_start_time,
+                jitter=min(5, check_interval // 4),
+            ),
             max_instances=1,
             coalesce=True,
-            next_run_time=check_start_time,
+            misfire_grace_time=check_interval,
             id="telegram_forwarder_check_updates",
             replace_existing=True,
         )
@@ -758,11 +816,14 @@ class Main(star.Star):
         send_start_time = datetime.now() + timedelta(seconds=startup_grace + 5)
         self.scheduler.add_job(
             self._run_send_pending_job,
-            "interval",
-            seconds=send_interval,
+            trigger=IntervalTrigger(
+                seconds=send_interval,
+                start_date=send_start_time,
+                jitter=min(5, send_interval // 4),
+            ),
             max_instances=1,
             coalesce=True,
-            next_run_time=send_start_time,
+            misfire_grace_time=send_interval,
             id="telegram_forwarder_send_pending",
             replace_existing=True,
         )
@@ -872,8 +933,6 @@ class Main(star.Star):
                 logger.debug(f"[Main] 断开连接时遇到异常 (通常不影响下次启动): {e}")
             finally:
                 # 始终清理缓存，确保下次插件加载时重建客户端。
-                from .core.client import TelegramClientWrapper
-
                 await TelegramClientWrapper.disconnect_and_clear_cache(session_path)
 
         logger.info("Telegram Forwarder 已停止")
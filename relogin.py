@@ -1,10 +1,14 @@
+import argparse
 import asyncio
+import getpass
+import os
+import sys
 from pathlib import Path
 from urllib.parse import unquote, urlparse
 
 import socks
 from telethon import TelegramClient
-from telethon.errors import SessionPasswordNeededError
+from telethon.errors import PhoneCodeInvalidError, SessionPasswordNeededError
 
 # 路径常量。
 PLUGIN_DIR = Path(__file__).resolve().parent
@@ -26,6 +30,7 @@ else:
     )
 
 SESSION_FILE = str(DATA_DIR / "user_session")
+CODE_INPUT_ATTEMPTS = 3
 CONFIG_FILE = DATA_DIR / "config.json"
 if not CONFIG_FILE.exists():
     # 如果数据目录中还没有配置文件，则回退到插件目录查找。
@@ -60,30 +65,106 @@ def parse_proxy_url(proxy_url: str):
     return (proxy_type, parsed.hostname, parsed.port)
 
 
-api_id_raw = input("请输入 API ID: ").strip()
-try:
-    api_id = int(api_id_raw)
-except ValueError:
-    raise SystemExit("API ID 必须是整数")
-api_hash = input("请输入 API Hash: ").strip()
-proxy_url = input(
-    "请输入代理地址 (可选, 如 http://127.0.0.1:10801, 直接回车跳过): "
-).strip()
-
-proxy_setting = None
-if proxy_url:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """解析命令行参数；未提供的参数回退到环境变量，仍缺失时再交互输入。"""
+    parser = argparse.ArgumentParser(description="Telegram Forwarder 重新登录助手")
+    parser.add_argument("--api-id", default=os.environ.get("TG_API_ID"))
+    parser.add_argument("--api-hash", default=os.environ.get("TG_API_HASH"))
+    parser.add_argument(
+        "--proxy",
+        default=os.environ.get("TG_PROXY"),
+        help="代理地址，如 http://127.0.0.1:10801；传空字符串表示不使用代理",
+    )
+    parser.add_argument("--phone", default=os.environ.get("TG_PHONE"))
+    parser.add_argument(
+        "--code",
+        default=os.environ.get("TG_CODE"),
+        help="验证码原文（不要每位加 1）",
+    )
+    parser.add_argument(
+        "--code-stdin",
+        action="store_true",
+        help="从标准输入读取一行作为验证码，便于 echo 12345 | python relogin.py ...",
+    )
+    return parser.parse_args(argv)
+
+
+def resolve_credentials(args: argparse.Namespace) -> tuple[int, str, tuple | None]:
+    """补齐 API 凭据与代理设置，只对缺失项发起交互输入。
+
+    `--code-stdin` 模式下标准输入只留给验证码，缺失的必填项直接报错退出，
+    未提供代理时视为不使用代理。
+    """
+    if args.code_stdin:
+        missing = [
+            flag
+            for flag, value in (
+                ("--api-id / TG_API_ID", args.api_id),
+                ("--api-hash / TG_API_HASH", args.api_hash),
+                ("--phone / TG_PHONE", args.phone),
+            )
+            if not (value or "").strip()
+        ]
+        if missing:
+            raise SystemExit(
+                "使用 --code-stdin 时标准输入只用于读取验证码，请通过参数或环境变量提供: "
+                + "、".join(missing)
+            )
+        if args.proxy is None:
+            args.proxy = ""
+
+    api_id_raw = args.api_id
+    if api_id_raw is None:
+        api_id_raw = input("请输入 API ID: ")
     try:
-        proxy_setting = parse_proxy_url(proxy_url)
-        print(f"使用代理: {proxy_setting}")
-    except Exception as e:
-        print(f"代理设置错误: {e}")
+        api_id = int(str(api_id_raw).strip())
+    except ValueError:
+        raise SystemExit("API ID 必须是整数")
+
+    api_hash = args.api_hash
+    if api_hash is None:
+        api_hash = input("请输入 API Hash: ")
+
+    proxy_url = args.proxy
+    if proxy_url is None:
+        proxy_url = input(
+            "请输入代理地址 (可选, 如 http://127.0.0.1:10801, 直接回车跳过): "
+        )
+    proxy_url = proxy_url.strip()
+
+    proxy_setting = None
+    if proxy_url:
+        try:
+            proxy_setting = parse_proxy_url(proxy_url)
+            print(f"使用代理: {proxy_setting}")
+        except Exception as e:
+            print(f"代理设置错误: {e}")
+    return api_id, api_hash.strip(), proxy_setting
 
 
 async def _async_input(prompt: str) -> str:
     return (await asyncio.to_thread(input, prompt)).strip()
 
 
-async def main():
+def _code_is_preset(args: argparse.Namespace) -> bool:
+    """验证码是否由 `--code` / `TG_CODE` / `--code-stdin` 预设（非交互）。"""
+    return args.code_stdin or args.code is not None
+
+
+async def _read_code(args: argparse.Namespace) -> str:
+    """获取验证码：预设了参数 / 标准输入时使用预设值，否则交互输入。
+
+    预设的验证码只能用一次，输错由调用方直接结束流程。
+    """
+    if args.code_stdin:
+        return (await asyncio.to_thread(sys.stdin.readline)).strip()
+    if args.code is not None:
+        return str(args.code).strip()
+    return await _async_input("请输入您收到的验证码原文（不要每位加 1）: ")
+
+
+async def main(args: argparse.Namespace):
+    api_id, api_hash, proxy_setting = resolve_credentials(args)
     print(f"正在连接... (Session路径: {SESSION_FILE})")
     client = None
     try:
@@ -96,18 +177,38 @@ async def main():
 
         if not await client.is_user_authorized():
             print("未授权，开始登录流程...")
-            phone = await _async_input("请输入手机号 (带国际区号, 如 +86138...): ")
-            await client.send_code_request(phone)
-
-            code = await _async_input("请输入您收到的验证码原文（不要每位加 1）: ")
-            try:
-                await client.sign_in(phone, code)
-            except SessionPasswordNeededError:
-                pw = await _async_input("请输入两步验证密码: ")
-                await client.sign_in(password=pw)
-            except Exception as e:
-                print(f"登录失败: {e}")
-                return
+            phone = (args.phone or "").strip() or await _async_input(
+                "请输入手机号 (带国际区号, 如 +86138...): "
+            )
+            sent_code = await client.send_code_request(phone)
+
+            # 验证码输错时沿用同一个 phone_code_hash 重新输入，不再重复申请验证码
+            for attempt in range(1, CODE_INPUT_ATTEMPTS + 1):
+                code = await _read_code(args)
+                try:
+                    await client.sign_in(
+                        phone, code, phone_code_hash=sent_code.phone_code_hash
+                    )
+                    break
+                except PhoneCodeInvalidError:
+                    if _code_is_preset(args):
+                        print("预设的验证码错误，登录失败。")
+                        return
+                    if attempt == CODE_INPUT_ATTEMPTS:
+                        print("验证码错误次数过多，登录失败。")
+                        return
+                    print(
+                        f"验证码错误，请重新输入 ({attempt}/{CODE_INPUT_ATTEMPTS})。"
+                    )
+                except SessionPasswordNeededError:
+                    pw = os.environ.get("TG_PASSWORD") or await asyncio.to_thread(
+                        getpass.getpass, "请输入两步验证密码: "
+                    )
+                    await client.sign_in(password=pw)
+                    break
+                except Exception as e:
+                    print(f"登录失败: {e}")
+                    return
 
         print("登录成功！")
         me = await client.get_me()
@@ -124,4 +225,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(parse_args()))